@@ -0,0 +1,38 @@
+"""Default values shared by the pipeline configuration."""
+
+# Default scraping parameters
+DEFAULT_TIMEOUT = 30
+DEFAULT_RETRIES = 3
+DEFAULT_DELAY = 1  # seconds between requests
+DEFAULT_MAX_CONCURRENT_URLS = 4
+
+# Browser timeouts (milliseconds)
+DEFAULT_NAV_TIMEOUT_MS = 15000
+DEFAULT_API_RESPONSE_TIMEOUT_MS = 10000
+
+# API response cache
+DEFAULT_API_RESPONSE_CACHE_DIR = "config/api_cache"
+DEFAULT_API_RESPONSE_CACHE_TTL = 0  # seconds, 0 disables the cache
+
+# Scrape result cache
+DEFAULT_SCRAPE_CACHE_DIR = "config/scrape_cache"
+DEFAULT_SCRAPE_CACHE_TTL = 0  # seconds, 0 disables the cache
+
+# Stop probing API configs once one returns this many products (0 waits for all)
+DEFAULT_API_TARGET_PRODUCT_COUNT = 0
+
+# Log file rotation
+DEFAULT_LOG_MAX_BYTES = 64 * 1024 * 1024  # 0 disables rotation
+DEFAULT_LOG_BACKUP_COUNT = 5
+DEFAULT_LOG_FLUSH_INTERVAL = 5  # seconds between log file flushes, 0 disables
+
+# Storage formats
+STORAGE_FORMAT_CSV = "csv"
+STORAGE_FORMAT_JSON = "json"
+STORAGE_FORMAT_PARQUET = "parquet"
+
+# User agent to avoid blocking
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+)
@@ -1,56 +1,143 @@
 """Configuration settings for the web scraping pipeline."""
 
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
-# Default scraping parameters
-DEFAULT_TIMEOUT = 30
-DEFAULT_RETRIES = 3
-DEFAULT_DELAY = 1  # seconds between requests
-
-# Storage formats
-STORAGE_FORMAT_CSV = "csv"
-STORAGE_FORMAT_JSON = "json"
-STORAGE_FORMAT_PARQUET = "parquet"
-
-# User agent to avoid blocking
-DEFAULT_USER_AGENT = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-    "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+from config.constants import (
+    DEFAULT_API_RESPONSE_CACHE_DIR,
+    DEFAULT_API_RESPONSE_CACHE_TTL,
+    DEFAULT_API_RESPONSE_TIMEOUT_MS,
+    DEFAULT_API_TARGET_PRODUCT_COUNT,
+    DEFAULT_DELAY,
+    DEFAULT_LOG_BACKUP_COUNT,
+    DEFAULT_LOG_FLUSH_INTERVAL,
+    DEFAULT_LOG_MAX_BYTES,
+    DEFAULT_MAX_CONCURRENT_URLS,
+    DEFAULT_NAV_TIMEOUT_MS,
+    DEFAULT_RETRIES,
+    DEFAULT_SCRAPE_CACHE_DIR,
+    DEFAULT_SCRAPE_CACHE_TTL,
+    DEFAULT_TIMEOUT,
+    DEFAULT_USER_AGENT,
+    STORAGE_FORMAT_CSV,
+    STORAGE_FORMAT_JSON,
+    STORAGE_FORMAT_PARQUET,
 )
 
+__all__ = [
+    "DEFAULT_API_RESPONSE_CACHE_DIR",
+    "DEFAULT_API_RESPONSE_CACHE_TTL",
+    "DEFAULT_API_RESPONSE_TIMEOUT_MS",
+    "DEFAULT_API_TARGET_PRODUCT_COUNT",
+    "DEFAULT_DELAY",
+    "DEFAULT_LOG_BACKUP_COUNT",
+    "DEFAULT_LOG_FLUSH_INTERVAL",
+    "DEFAULT_LOG_MAX_BYTES",
+    "DEFAULT_MAX_CONCURRENT_URLS",
+    "DEFAULT_NAV_TIMEOUT_MS",
+    "DEFAULT_RETRIES",
+    "DEFAULT_SCRAPE_CACHE_DIR",
+    "DEFAULT_SCRAPE_CACHE_TTL",
+    "DEFAULT_TIMEOUT",
+    "DEFAULT_USER_AGENT",
+    "STORAGE_FORMAT_CSV",
+    "STORAGE_FORMAT_JSON",
+    "STORAGE_FORMAT_PARQUET",
+    "Settings",
+    "get_settings",
+    "settings",
+]
+
 
+@dataclass(frozen=True, slots=True)
 class Settings:
     """Configuration settings loaded from environment variables or defaults."""
 
-    def __init__(self):
-        # Target URL
-        self.base_url: str = os.getenv(
-            "BASE_URL", "https://www.misuperfresh.com.gt"
-        )
-        self.catalog_url: str = os.getenv(
-            "CATALOG_URL",
-            "https://www.misuperfresh.com.gt/catalog/9?minPrice=0&maxPrice=225",
-        )
+    # Target URL
+    base_url: str
+    catalog_url: str
+
+    # Scraping parameters
+    timeout: int
+    max_retries: int
+    delay: float
+    user_agent: str
+    max_concurrent_urls: int
+    nav_timeout_ms: int
+    api_response_timeout_ms: int
 
-        # Scraping parameters
-        self.timeout: int = int(os.getenv("TIMEOUT", str(DEFAULT_TIMEOUT)))
-        self.max_retries: int = int(os.getenv("MAX_RETRIES", str(DEFAULT_RETRIES)))
-        self.delay: float = float(os.getenv("DELAY", str(DEFAULT_DELAY)))
-        self.user_agent: str = os.getenv("USER_AGENT", DEFAULT_USER_AGENT)
+    # Storage settings
+    output_dir: str
+    storage_format: str
 
-        # Storage settings
-        self.output_dir: str = os.getenv("OUTPUT_DIR", "data")
-        self.storage_format: str = os.getenv("STORAGE_FORMAT", "json")
+    # API scraping settings
+    api_force_all_products: bool
+    api_cache_config: bool
+    api_include_raw_data: bool
+    api_target_product_count: int
+    api_response_cache_dir: str
+    api_response_cache_ttl: float
+    scrape_cache_dir: str
+    scrape_cache_ttl: float
 
-        # API scraping settings
-        self.api_force_all_products: bool = os.getenv("API_FORCE_ALL_PRODUCTS", "true").lower() == "true"
-        self.api_cache_config: bool = os.getenv("API_CACHE_CONFIG", "true").lower() == "true"
+    # Logging
+    log_level: str
+    log_file: Optional[str]
+    log_format: str
+    log_max_bytes: int
+    log_backup_count: int
+    log_force_console: bool
+    log_flush_interval: float
+    log_udp_addr: Optional[str]
 
-        # Logging
-        self.log_level: str = os.getenv("LOG_LEVEL", "INFO")
-        self.log_file: Optional[str] = os.getenv("LOG_FILE", "scraper.log")
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Build the settings from the environment.
+
+    Environment variables are read once per process; later calls return
+    the cached instance.
+
+    Returns:
+        Settings instance
+    """
+    env = os.environ
+    return Settings(
+        base_url=env.get("BASE_URL", "https://www.misuperfresh.com.gt"),
+        catalog_url=env.get(
+            "CATALOG_URL",
+            "https://www.misuperfresh.com.gt/catalog/9?minPrice=0&maxPrice=225",
+        ),
+        timeout=int(env.get("TIMEOUT", DEFAULT_TIMEOUT)),
+        max_retries=int(env.get("MAX_RETRIES", DEFAULT_RETRIES)),
+        delay=float(env.get("DELAY", DEFAULT_DELAY)),
+        user_agent=env.get("USER_AGENT", DEFAULT_USER_AGENT),
+        max_concurrent_urls=int(env.get("MAX_CONCURRENT_URLS", DEFAULT_MAX_CONCURRENT_URLS)),
+        nav_timeout_ms=int(env.get("NAV_TIMEOUT_MS", DEFAULT_NAV_TIMEOUT_MS)),
+        api_response_timeout_ms=int(env.get("API_RESPONSE_TIMEOUT_MS", DEFAULT_API_RESPONSE_TIMEOUT_MS)),
+        output_dir=env.get("OUTPUT_DIR", "data"),
+        storage_format=env.get("STORAGE_FORMAT", "json"),
+        api_force_all_products=env.get("API_FORCE_ALL_PRODUCTS", "true").lower() == "true",
+        api_cache_config=env.get("API_CACHE_CONFIG", "true").lower() == "true",
+        api_include_raw_data=env.get("API_INCLUDE_RAW_DATA", "false").lower() == "true",
+        api_target_product_count=int(env.get("API_TARGET_PRODUCT_COUNT", DEFAULT_API_TARGET_PRODUCT_COUNT)),
+        api_response_cache_dir=env.get("API_RESPONSE_CACHE_DIR", DEFAULT_API_RESPONSE_CACHE_DIR),
+        api_response_cache_ttl=float(env.get("API_RESPONSE_CACHE_TTL", DEFAULT_API_RESPONSE_CACHE_TTL)),
+        scrape_cache_dir=env.get("SCRAPE_CACHE_DIR", DEFAULT_SCRAPE_CACHE_DIR),
+        scrape_cache_ttl=float(env.get("SCRAPE_CACHE_TTL", DEFAULT_SCRAPE_CACHE_TTL)),
+        log_level=env.get("LOG_LEVEL", "INFO"),
+        log_file=env.get("LOG_FILE", "scraper.log"),
+        log_format=env.get("LOG_FORMAT", "text").lower(),
+        log_max_bytes=int(env.get("LOG_MAX_BYTES", DEFAULT_LOG_MAX_BYTES)),
+        log_backup_count=int(env.get("LOG_BACKUP_COUNT", DEFAULT_LOG_BACKUP_COUNT)),
+        log_force_console=env.get("LOG_FORCE_CONSOLE", "false").lower() == "true",
+        log_flush_interval=float(env.get("LOG_FLUSH_INTERVAL", DEFAULT_LOG_FLUSH_INTERVAL)),
+        log_udp_addr=env.get("LOG_UDP_ADDR") or None,
+    )
 
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
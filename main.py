@@ -1,12 +1,17 @@
 """Main entry point for the web scraping pipeline."""
 
 import sys
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from queue import Empty, Queue
+from typing import List, Dict, Any, Optional, Tuple
 from scraper.api_scraper import ApiScraper
 from storage.file_storage import FileStorage
 from config.settings import settings
 from utils.logger import logger
 
+BANNER = "=" * 60
+
 
 def scrape_page_api(scraper: ApiScraper, url: str) -> dict:
     """
@@ -19,7 +24,7 @@ def scrape_page_api(scraper: ApiScraper, url: str) -> dict:
     Returns:
         Dictionary with scraped data
     """
-    logger.info(f"Scraping page via API: {url}")
+    logger.info("Scraping page via API: %s", url)
     result = scraper.scrape(url, wait_time=20)
     return result
 
@@ -34,24 +39,31 @@ def scrape_all_pages_api(scraper: ApiScraper, start_url: str, max_pages: int = 1
         max_pages: Maximum number of pages to scrape
 
     Returns:
-        List of all products from all pages
+        List of all unique products from all pages
     """
     all_products = []
+    seen = set()
     current_url = start_url
     page_num = 1
 
-    logger.info(f"Starting pagination scraping from: {start_url}")
+    logger.info("Starting pagination scraping from: %s", start_url)
 
     while current_url and page_num <= max_pages:
-        logger.info("=" * 60)
-        logger.info(f"SCRAPING PAGE {page_num}")
-        logger.info("=" * 60)
+        logger.info(BANNER)
+        logger.info("SCRAPING PAGE %d", page_num)
+        logger.info(BANNER)
 
         result = scrape_page_api(scraper, current_url)
         products = result.get("products", [])
-        all_products.extend(products)
 
-        logger.info(f"Page {page_num}: Found {len(products)} products (Total so far: {len(all_products)})")
+        # Overlapping pages may repeat products; keep the first of each
+        for product in products:
+            key = product.get("barcode") or (product.get("name"), product.get("price"))
+            if key not in seen:
+                seen.add(key)
+                all_products.append(product)
+
+        logger.info("Page %d: Found %d products (Total so far: %d)", page_num, len(products), len(all_products))
 
         # Check for next page
         next_page = result.get("next_page")
@@ -64,34 +76,85 @@ def scrape_all_pages_api(scraper: ApiScraper, start_url: str, max_pages: int = 1
             logger.info("No more pages available")
             break
 
-    logger.info(f"Completed pagination: {page_num} pages, {len(all_products)} total products")
+    logger.info("Completed pagination: %d pages, %d total products", page_num, len(all_products))
     return all_products
 
 
-def scrape_multiple_urls(urls: List[str]) -> List[Dict[str, Any]]:
+def scrape_url_queue(pending: "Queue[Tuple[int, str]]", results: List[List[Dict[str, Any]]]) -> None:
+    """
+    Scrape URLs from a shared queue until it is empty.
+
+    Runs in a worker thread; every URL taken by this worker reuses the
+    thread's browser, which is shut down once the queue is drained.
+
+    Args:
+        pending: Queue of (index, URL) pairs to scrape
+        results: Per-URL product lists, filled in at each URL's index
+    """
+    try:
+        with ApiScraper() as scraper:
+            while True:
+                try:
+                    i, url = pending.get_nowait()
+                except Empty:
+                    return
+                results[i] = scrape_all_pages_api(scraper, url)
+                logger.info("URL %d/%d complete: %s (%d products)", i + 1, len(results), url, len(results[i]))
+    finally:
+        ApiScraper.shutdown()
+
+
+def scrape_multiple_urls(urls: List[str], max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
     """
     Scrape multiple URLs and collect all products.
 
+    URLs are scraped concurrently by worker threads, each with its own
+    browser, since Playwright's sync API cannot be shared across threads.
+
     Args:
         urls: List of URLs to scrape
+        max_workers: Maximum number of URLs scraped at once
 
     Returns:
-        List of all products from all URLs
+        List of all products from all URLs, in URL order
     """
     all_products = []
+    workers = min(max_workers or settings.max_concurrent_urls, len(urls))
+
+    logger.info("Scraping %d URLs using API scraper (%d at a time)...", len(urls), max(workers, 1))
+
+    if workers <= 1:
+        # Single worker: reuse one browser for every URL, shut down once
+        # all are done, as the pooled workers do
+        try:
+            with ApiScraper() as scraper:
+                for i, url in enumerate(urls, 1):
+                    logger.info("\n%s", BANNER)
+                    logger.info("URL %d/%d: %s", i, len(urls), url)
+                    logger.info(BANNER)
+
+                    # Scrape all pages for this URL
+                    products = scrape_all_pages_api(scraper, url)
+                    all_products.extend(products)
 
-    logger.info(f"Scraping {len(urls)} URLs using API scraper...")
-    with ApiScraper() as scraper:
-        for i, url in enumerate(urls, 1):
-            logger.info(f"\n{'=' * 60}")
-            logger.info(f"URL {i}/{len(urls)}: {url}")
-            logger.info(f"{'=' * 60}")
+                    logger.info("URL %d complete: %d products", i, len(products))
+        finally:
+            ApiScraper.shutdown()
 
-            # Scrape all pages for this URL
-            products = scrape_all_pages_api(scraper, url)
-            all_products.extend(products)
+        return all_products
 
-            logger.info(f"URL {i} complete: {len(products)} products")
+    pending: "Queue[Tuple[int, str]]" = Queue()
+    for item in enumerate(urls):
+        pending.put(item)
+    results: List[List[Dict[str, Any]]] = [[] for _ in urls]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(scrape_url_queue, pending, results) for _ in range(workers)]
+        for future in futures:
+            future.result()
+
+    for products in results:
+        all_products.extend(products)
 
     return all_products
 
@@ -105,9 +168,9 @@ def main():
         settings.catalog_url,  # Current URL
     ]
 
-    logger.info(f"Scraping {len(urls_to_scrape)} URL(s)")
+    logger.info("Scraping %d URL(s)", len(urls_to_scrape))
     for i, url in enumerate(urls_to_scrape, 1):
-        logger.info(f"  {i}. {url}")
+        logger.info("  %d. %s", i, url)
 
     # Scrape via API interception
     logger.info("\nAttempting to scrape via API interception...")
@@ -115,31 +178,36 @@ def main():
         all_products = scrape_multiple_urls(urls_to_scrape)
 
         if all_products:
-            logger.info(f"\nSuccessfully scraped {len(all_products)} total products via API")
+            logger.info("\nSuccessfully scraped %d total products via API", len(all_products))
 
             # Display summary
-            print("\n" + "=" * 60)
-            print("SCRAPING SUMMARY")
-            print("=" * 60)
-            print(f"Total products found: {len(all_products)}")
-            print(f"URLs scraped: {len(urls_to_scrape)}")
-            print("\nSample products (first 10):")
-            for i, product in enumerate(all_products[:10], 1):
-                print(f"  {i}. {product.get('name', 'N/A')} - {product.get('price', 'N/A')}")
-
+            summary = [
+                "\n" + BANNER,
+                "SCRAPING SUMMARY",
+                BANNER,
+                f"Total products found: {len(all_products)}",
+                f"URLs scraped: {len(urls_to_scrape)}",
+                "\nSample products (first 10):",
+            ]
+            summary.extend(
+                f"  {i}. {product.get('name', 'N/A')} - {product.get('price', 'N/A')}"
+                for i, product in enumerate(all_products[:10], 1)
+            )
             if len(all_products) > 10:
-                print(f"\n  ... and {len(all_products) - 10} more products")
+                summary.append(f"\n  ... and {len(all_products) - 10} more products")
+            print("\n".join(summary))
 
             # Save to files
             logger.info("\nSaving data to files...")
             storage = FileStorage()
             saved_files = storage.save(all_products, format="all")
 
-            print("\n" + "=" * 60)
-            print("FILES SAVED")
-            print("=" * 60)
-            for format_type, filepath in saved_files.items():
-                print(f"  {format_type.upper()}: {filepath.absolute()}")
+            cwd = Path.cwd()
+            saved_report = "\n".join(
+                f"  {format_type.upper()}: {cwd / filepath}"
+                for format_type, filepath in saved_files.items()
+            )
+            print(f"\n{BANNER}\nFILES SAVED\n{BANNER}\n{saved_report}")
 
             logger.info("Scraping pipeline completed")
             return
@@ -3,64 +3,136 @@ Process scraped product data to generate a text file for ChatGPT.
 Filters out non-edible categories and formats the output.
 """
 
-import json
+from __future__ import annotations
+
+import os
 import argparse
 import sys
 from pathlib import Path
 from datetime import datetime
-from io import StringIO
-import pandas as pd
+from typing import TYPE_CHECKING
+from utils.json_utils import json_loads
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Formatter for numeric prices, bound once at import
+format_price = "Q{:.2f}".format
+
+# Scraped data files, in order of preference
+DATA_FILE_SUFFIXES = (".parquet", ".json")
+
+# Files larger than this are stream-parsed with ijson (when installed)
+STREAMING_THRESHOLD_BYTES = 50_000_000
 
 # Categories to exclude (non-edible)
-NON_EDIBLE_CATEGORIES = [
+NON_EDIBLE_CATEGORIES = frozenset([
     "Bebe",
     "Cuidado Del Hogar / Hogar Y Librería",
     "Cuidado Del Hogar / Limpieza, Ropa Y Hogar",
     "Cuidado Personal",
     "Mascotas",
     "Medicinales"
-]
+])
+
+# Heading for products without a category or subcategory
+MISSING_GROUP_LABEL = "Sin clasificar"
+
+# Scraped field names and their Spanish column names
+COLUMN_MAPPING = {
+    "barcode": "codigo_barras",
+    "category": "categoria",
+    "description": "descripcion",
+    "image_url": "url_imagen",
+    "name": "nombre",
+    "offer_description": "descripcion_oferta",
+    "offer_price": "precio_oferta",
+    "price": "precio",
+    "stock": "inventario",
+    "subcategory": "subcategoria"
+}
 
-def get_latest_json_file(data_dir: Path) -> Path:
-    """Find the latest products JSON file in the data directory."""
-    json_files = list(data_dir.glob("products_*.json"))
-    if not json_files:
-        raise FileNotFoundError(f"No JSON files found in {data_dir}")
+def get_latest_data_file(data_dir: Path) -> Path:
+    """Find the latest products data file, preferring Parquet over JSON."""
+    with os.scandir(data_dir) as entries:
+        candidates = [
+            (entry.stat().st_mtime, entry.path)
+            for entry in entries
+            if entry.name.startswith("products_") and entry.name.endswith(DATA_FILE_SUFFIXES)
+        ]
+    if not candidates:
+        raise FileNotFoundError(f"No products data files found in {data_dir}")
     
-    return max(json_files, key=lambda p: p.stat().st_mtime)
+    return prefer_parquet(Path(max(candidates)[1]))
+
+def prefer_parquet(file_path: Path) -> Path:
+    """Return the Parquet copy of a scraped file if one was saved alongside it."""
+    parquet_path = file_path.with_suffix(".parquet")
+    return parquet_path if parquet_path.exists() else file_path
+
+def read_parquet_products(file_path: Path) -> pd.DataFrame:
+    """Read the product columns from a Parquet file, skipping raw_data.
+
+    Keeps the same columns as the JSON loader, so either file of a scrape
+    yields the same frame.
+    """
+    import pandas as pd
+    import pyarrow.parquet as pq
+    
+    columns = [name for name in pq.read_schema(file_path).names if name != "raw_data"]
+    return pd.read_parquet(file_path, columns=columns).rename(columns=COLUMN_MAPPING)
+
+def read_products(file_path: Path) -> list:
+    """Read the products list from a scraped JSON file.
+
+    Large files are parsed incrementally so the raw_data of each product can
+    be dropped before the next one is read.
+    """
+    if ijson is not None and file_path.stat().st_size > STREAMING_THRESHOLD_BYTES:
+        products = []
+        with open(file_path, "rb") as f:
+            for product in ijson.items(f, "products.item", use_float=True):
+                product.pop("raw_data", None)
+                products.append(product)
+        return products
+    
+    with open(file_path, "rb") as f:
+        data = json_loads(f.read())
+    return data.get("products", [])
 
 def load_data(file_path: Path) -> pd.DataFrame:
-    """Load JSON data and convert to DataFrame with Spanish column names."""
+    """Load JSON or Parquet data into a DataFrame with Spanish column names."""
+    import pandas as pd
+    
     print(f"Loading data from: {file_path}")
     
-    with open(file_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    if file_path.suffix == ".parquet":
+        df = read_parquet_products(file_path)
+    else:
+        products = read_products(file_path)
+        
+        # Build the frame column by column, renaming to Spanish and skipping
+        # raw_data so it never gets copied into pandas
+        fields = dict.fromkeys(key for product in products for key in product)
+        fields.pop("raw_data", None)
+        columns = {
+            COLUMN_MAPPING.get(field, field): [product.get(field) for product in products]
+            for field in fields
+        }
+        df = pd.DataFrame(columns)
     
-    products = data.get("products", [])
-    print(f"Total products loaded: {len(products)}")
+    print(f"Total products loaded: {len(df)}")
     
-    df = pd.DataFrame(products)
+    # Few distinct categories: store them as integer codes
+    if "categoria" in df.columns:
+        df["categoria"] = df["categoria"].astype("category")
     
-    # Remove raw_data if exists
-    if "raw_data" in df.columns:
-        df = df.drop(columns=["raw_data"])
-        
-    # Rename columns to Spanish
-    column_mapping = {
-        "barcode": "codigo_barras",
-        "category": "categoria",
-        "description": "descripcion",
-        "image_url": "url_imagen",
-        "name": "nombre",
-        "offer_description": "descripcion_oferta",
-        "offer_price": "precio_oferta",
-        "price": "precio",
-        "stock": "inventario",
-        "subcategory": "subcategoria"
-    }
-    
-    df_spanish = df.rename(columns={k: v for k, v in column_mapping.items() if k in df.columns})
-    return df_spanish
+    return df
 
 def filter_edible_products(df: pd.DataFrame) -> pd.DataFrame:
     """Filter out non-edible products based on category."""
@@ -74,70 +146,90 @@ def filter_edible_products(df: pd.DataFrame) -> pd.DataFrame:
     
     return df_edible
 
-def generate_text_file(df: pd.DataFrame, output_path: Path):
-    """Generate a formatted text file with product list and prices."""
-    output_buffer = StringIO()
+def format_prices(precios: pd.Series) -> pd.Series:
+    """Format prices as 'Q0.00' strings, keeping non-numeric values as-is."""
+    import pandas as pd
+    
+    numeric = pd.to_numeric(precios, errors="coerce")
+    precio_str = ("Q" + precios.astype(str)).where(
+        numeric.isna(), numeric.map(format_price, na_action="ignore")
+    )
+    return precio_str.mask(precios.isna(), "Q0.00")
 
-    def print_and_save(text):
-        print(text)
-        output_buffer.write(text + "\n")
+def generate_text_file(df: pd.DataFrame, output_path: Path, echo: bool = False):
+    """Generate a formatted text file with product list and prices.
 
-    print_and_save("=" * 60)
-    print_and_save("PRODUCTOS COMESTIBLES CON PRECIOS")
-    print_and_save("=" * 60)
+    Sections are written straight to the output file as they are built; when
+    ``echo`` is set they are also printed to stdout.
+    """
+    import pandas as pd
+    
+    header = "\n".join([
+        "=" * 60,
+        "PRODUCTOS COMESTIBLES CON PRECIOS",
+        "=" * 60,
+    ])
+    
+    if 'categoria' not in df.columns or 'subcategoria' not in df.columns:
+        print(header)
+        print("Error: Required columns 'categoria' or 'subcategoria' not found.")
+        return
+    
+    # Sort by category, subcategory and name
+    df_sorted = df.sort_values(['categoria', 'subcategoria', 'nombre'])
     
-    if 'categoria' in df.columns and 'subcategoria' in df.columns:
-        # Sort by category, subcategory and name
-        df_sorted = df.sort_values(['categoria', 'subcategoria', 'nombre'])
+    # Format every product line in a single vectorized pass
+    precios = df_sorted['precio'] if 'precio' in df_sorted.columns else pd.Series("N/A", index=df_sorted.index)
+    df_sorted = df_sorted.assign(
+        # Missing names print as "nan" like the row-by-row version did;
+        # pandas' string dtype keeps them as NA through astype(str)
+        linea="    " + df_sorted['nombre'].astype(str).fillna("nan") + " - " + format_prices(precios)
+    )
+    
+    with open(output_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        def write_section(text):
+            f.write(text + "\n")
+            if echo:
+                print(text)
         
-        # Get unique categories
-        categorias = sorted(df_sorted['categoria'].unique())
+        write_section(header)
         
-        for categoria in categorias:
-            df_categoria = df_sorted[df_sorted['categoria'] == categoria]
-            subcategorias = sorted(df_categoria['subcategoria'].unique())
-            
-            print_and_save(f"\nCATEGORIA: {categoria}")
-            print_and_save("=" * 60)
+        # Partition once by category and subcategory; the frame is already
+        # sorted, so groups come out in order without sorting the keys again
+        parts = []
+        categoria_actual = None
+        # Products missing a category or subcategory are kept, listed last
+        grupos = df_sorted.groupby(['categoria', 'subcategoria'], sort=False, observed=True, dropna=False)
+        
+        for (categoria, subcategoria), df_subcat in grupos:
+            if pd.isna(categoria):
+                categoria = MISSING_GROUP_LABEL
+            if pd.isna(subcategoria):
+                subcategoria = MISSING_GROUP_LABEL
+            if categoria != categoria_actual:
+                if parts:
+                    write_section("\n".join(parts))
+                parts = [f"\nCATEGORIA: {categoria}", "=" * 60]
+                categoria_actual = categoria
             
-            for subcategoria in subcategorias:
-                df_subcat = df_categoria[df_categoria['subcategoria'] == subcategoria]
-                
-                print_and_save(f"\n  SUBCATEGORIA: {subcategoria} ({len(df_subcat)} productos)")
-                print_and_save("  " + "-" * 58)
-                
-                # Print each product
-                for _, row in df_subcat.iterrows():
-                    nombre = row.get('nombre', 'N/A')
-                    precio = row.get('precio', 'N/A')
-                    
-                    # Format price
-                    if pd.notna(precio):
-                        try:
-                            precio_num = float(precio)
-                            precio_str = f"Q{precio_num:.2f}"
-                        except (ValueError, TypeError):
-                            precio_str = f"Q{precio}"
-                    else:
-                        precio_str = "Q0.00"
-                    
-                    print_and_save(f"    {nombre} - {precio_str}")
+            parts.append(f"\n  SUBCATEGORIA: {subcategoria} ({len(df_subcat)} productos)")
+            parts.append("  " + "-" * 58)
+            parts.append(df_subcat['linea'].str.cat(sep="\n"))
         
-        print_and_save("\n" + "=" * 60)
-        print_and_save(f"Total productos comestibles mostrados: {len(df_sorted)}")
+        if parts:
+            write_section("\n".join(parts))
         
-        # Save to file
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(output_buffer.getvalue())
-            
-        print(f"\nFile saved to: {output_path.absolute()}")
-    else:
-        print("Error: Required columns 'categoria' or 'subcategoria' not found.")
+        write_section("\n" + "=" * 60 + f"\nTotal productos comestibles mostrados: {len(df_sorted)}")
+    
+    if not echo:
+        print(f"Total productos comestibles mostrados: {len(df_sorted)}")
+    print(f"\nFile saved to: {output_path.absolute()}")
 
 def main():
     parser = argparse.ArgumentParser(description="Process scraped product data.")
-    parser.add_argument("--input", help="Path to input JSON file (optional, defaults to latest)")
+    parser.add_argument("--input", help="Path to input JSON or Parquet file (optional, defaults to latest)")
     parser.add_argument("--output-dir", default="data", help="Directory for output files")
+    parser.add_argument("--verbose", action="store_true", help="Also print the full product list to stdout")
     args = parser.parse_args()
     
     try:
@@ -147,24 +239,25 @@ def main():
             if not input_path.exists():
                 print(f"Error: Input file {input_path} not found.")
                 sys.exit(1)
+            input_path = prefer_parquet(input_path)
         else:
             data_dir = Path("data")
             if not data_dir.exists():
                 print(f"Error: Data directory {data_dir} not found.")
                 sys.exit(1)
-            input_path = get_latest_json_file(data_dir)
+            input_path = get_latest_data_file(data_dir)
             
         # Determine output path
         output_dir = Path(args.output_dir)
         output_dir.mkdir(exist_ok=True)
         
-        output_filename = input_path.stem.replace(".json", "") + "_productos_comestibles.txt"
+        output_filename = input_path.stem + "_productos_comestibles.txt"
         output_path = output_dir / output_filename
         
         # Process data
         df = load_data(input_path)
         df_edible = filter_edible_products(df)
-        generate_text_file(df_edible, output_path)
+        generate_text_file(df_edible, output_path, echo=args.verbose)
         
     except Exception as e:
         print(f"Error processing data: {e}")
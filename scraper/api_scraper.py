@@ -1,18 +1,72 @@
 """API-based scraper that intercepts Flutter app API calls."""
 
+import atexit
 import json
+import logging
+import os
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from playwright.sync_api import sync_playwright, Page, Response
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs, parse_qsl, urlencode, urlunparse
+from playwright.sync_api import sync_playwright, Page, Response, Route
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 from scraper.base_scraper import BaseScraper
+from storage.api_cache import ApiResponseCache, ScrapeResultCache
 from config.settings import settings
 from utils.logger import logger
+from utils.error_handler import retry_with_backoff
+from utils.json_utils import json_dumps, json_loads
+
+# Products endpoint of the MiSuperFresh API
+PRODUCTS_API_URL = "https://msf-api.gta.com.gt/api/products"
+
+# Resource types never needed to trigger the products API calls
+BLOCKED_RESOURCE_TYPES = frozenset(("image", "media", "font", "stylesheet"))
+
+# Cached best request config (and captured request template)
+CONFIG_CACHE_FILE = Path("config/api_config_cache.json")
+
+# Request body keys set per config/URL rather than taken from a template
+CONFIG_KEYS = ("type", "subcategoryId", "minPrice", "maxPrice")
+
+# Item fields that may hold the product name / price, most likely first
+NAME_FIELDS = ("name", "productName", "title", "productTitle", "nombre", "descripcion", "description", "productDescription")
+PRICE_FIELDS = ("price", "precio", "cost", "costo", "amount", "valor", "unitPrice", "unit_price", "salePrice", "sale_price")
+
+# Item fields copied verbatim onto the product, left out of raw_data
+HOISTED_FIELDS = frozenset(("name", "price", "description", "barcode", "stock"))
+
+# Currency symbols and separators stripped from prices
+CURRENCY_SYMBOLS = str.maketrans("", "", "Q$,")
+PRICE_PATTERN = re.compile(r"[\d.]+")
+
+# Products API filters probed when the app's own request returns few
+# products, most likely to return the full subcategory first
+TEST_CONFIGS = (
+    {"type": 0, "subcategoryId": None},  # All products in subcategory (usually best)
+    {"type": 1, "subcategoryId": None},  # Featured
+    {"subcategoryId": None},  # No type filter
+    {"type": 0},  # All products, no subcategory
+    {},  # No filters at all
+)
+
+# Keys that may hold pagination info in a products response
+PAGINATION_FIELDS = ("pagination", "pageInfo", "page_info", "paging", "meta")
+
+# Keys that may hold the product list in an API response, most likely first
+PRODUCT_LIST_KEYS = ("products", "items", "data", "results", "content")
 
 
 class ApiScraper(BaseScraper):
     """Scraper that extracts data by intercepting API calls from Flutter app."""
 
+    # Playwright's sync API is bound to the thread that started it, so the
+    # browser is shared between scrapers of the same thread only
+    _shared = threading.local()
+
     def __init__(self, **kwargs):
         """Initialize the API scraper."""
         super().__init__(**kwargs)
@@ -22,37 +76,69 @@ class ApiScraper(BaseScraper):
         self.context = None
         self.page: Optional[Page] = None
         self.api_responses: List[Dict[str, Any]] = []
-        self._start_browser()
+        self.original_request_body: Optional[Dict[str, Any]] = None
+        self.response_cache = ApiResponseCache()
+        self.result_cache = ScrapeResultCache()
+        # The browser is started lazily, only when a page must be rendered
 
     def _start_browser(self):
-        """Start the Playwright browser."""
+        """Open a context and page on the shared browser, launching it if needed."""
         try:
-            self.playwright = sync_playwright().start()
-            self.browser = self.playwright.chromium.launch(headless=True)
+            shared = ApiScraper._shared
+            if getattr(shared, "browser", None) is None:
+                shared.playwright = sync_playwright().start()
+                shared.browser = shared.playwright.chromium.launch(headless=True)
+                logger.info("Browser started for API interception")
+                if threading.current_thread() is threading.main_thread():
+                    atexit.register(ApiScraper.shutdown)
+            self.playwright = shared.playwright
+            self.browser = shared.browser
             self.context = self.browser.new_context(
                 user_agent=self.user_agent,
                 viewport={"width": 1920, "height": 1080},
             )
+            # Page-level routes (the API interception) take precedence
+            self.context.route("**/*", self._block_heavy_resources)
             self.page = self.context.new_page()
-            logger.info("Browser started for API interception")
         except Exception as e:
             logger.error(f"Failed to start browser: {e}")
             raise
 
     def close(self):
-        """Close the browser and cleanup."""
+        """Close this scraper's page and context; the shared browser stays up."""
         try:
             if self.page:
                 self.page.close()
             if self.context:
                 self.context.close()
-            if self.browser:
-                self.browser.close()
-            if self.playwright:
-                self.playwright.stop()
-            logger.info("Browser closed")
+            self.page = None
+            self.context = None
+        except Exception as e:
+            logger.error(f"Error closing browser context: {e}")
+
+    @staticmethod
+    def _block_heavy_resources(route: Route):
+        """Abort images, media, fonts and stylesheets; let everything else through."""
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            route.abort()
+        else:
+            route.continue_()
+
+    @classmethod
+    def shutdown(cls):
+        """Close the browser shared by scrapers on the current thread."""
+        shared = cls._shared
+        try:
+            if getattr(shared, "browser", None) is not None:
+                shared.browser.close()
+            if getattr(shared, "playwright", None) is not None:
+                shared.playwright.stop()
+                logger.info("Browser closed")
         except Exception as e:
             logger.error(f"Error closing browser: {e}")
+        finally:
+            shared.browser = None
+            shared.playwright = None
 
     def wait_between_requests(self):
         """Wait between requests to be respectful to the server."""
@@ -60,52 +146,75 @@ class ApiScraper(BaseScraper):
             time.sleep(self.delay)
 
     def _setup_api_interception(self):
-        """Set up API response interception."""
-        self.api_responses = []
+        """
+        Set up API interception on a fresh page.
 
-        def handle_response(response: Response):
-            """Sync handler - read body immediately."""
-            url = response.url
-            if "msf-api.gta.com.gt" in url:
+        Captures the app's products request body for reuse as a template
+        and collects subcategory responses. Products responses are read
+        once, by the code waiting for them.
+        """
+
+        def handle_route(route: Route):
+            """Capture the products request body and let every request through."""
+            request = route.request
+            if "msf-api.gta.com.gt/api/products" in request.url and request.method == "POST":
                 try:
-                    content_type = response.headers.get("content-type", "")
-                    if "application/json" in content_type or "json" in content_type.lower():
-                        # Use response.json() which should work in the handler
-                        try:
-                            # Try to get the response asynchronously - we need to wait for it
-                            # Actually, in sync API, we can use response.json() directly
-                            body = response.json()
-                            self.api_responses.append({
-                                "url": url,
-                                "method": response.request.method,
-                                "status": response.status,
-                                "body": body,
-                                "timestamp": time.time(),
-                            })
-                            logger.info(f"Captured API response: {url} (Status: {response.status})")
-                            if isinstance(body, list):
-                                logger.info(f"  Found {len(body)} items")
-                                if len(body) > 0:
-                                    logger.info(f"  Sample item keys: {list(body[0].keys()) if isinstance(body[0], dict) else 'N/A'}")
-                            elif isinstance(body, dict):
-                                logger.info(f"  Keys: {list(body.keys())}")
-                        except Exception as e:
-                            logger.warning(f"Could not parse JSON from {url}: {e}")
-                            # Try alternative: read body as text
-                            try:
-                                body_text = response.text()
-                                logger.debug(f"Response text (first 200 chars): {body_text[:200]}")
-                            except:
-                                pass
-                except Exception as e:
-                    logger.debug(f"Error processing response {url}: {e}")
+                    if request.post_data:
+                        self.original_request_body = json_loads(request.post_data)
+                        logger.info(f"Captured POST request body: {json.dumps(self.original_request_body, indent=2)}")
+                except:
+                    pass
+            route.continue_()
 
+        def handle_response(response: Response):
+            """Collect subcategory responses."""
+            if "msf-api.gta.com.gt/api/catalog/subcategory" in response.url and response.status == 200:
+                self._capture_response(response)
+
+        self.page.route("**/msf-api.gta.com.gt/api/**", handle_route)
         self.page.on("response", handle_response)
 
+    def _capture_response(self, response: Response) -> Optional[Dict[str, Any]]:
+        """
+        Parse an API response body and record it.
+
+        Args:
+            response: Playwright response from the API
+
+        Returns:
+            Recorded response entry, or None if the body is not JSON
+        """
+        url = response.url
+        try:
+            body = json_loads(response.body())
+        except Exception as e:
+            logger.warning(f"Could not parse JSON from {url}: {e}")
+            return None
+
+        captured = {
+            "url": url,
+            "method": response.request.method,
+            "status": response.status,
+            "body": body,
+        }
+        self.api_responses.append(captured)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Captured API response: {url} (Status: {response.status})")
+            if isinstance(body, list):
+                logger.info(f"  Found {len(body)} items")
+                if len(body) > 0:
+                    logger.info(f"  Sample item keys: {list(body[0].keys()) if isinstance(body[0], dict) else 'N/A'}")
+            elif isinstance(body, dict):
+                logger.info(f"  Keys: {list(body.keys())}")
+        return captured
+
     def scrape(self, url: str, wait_time: int = 20) -> Dict[str, Any]:
         """
         Scrape data by intercepting API calls.
 
+        Results with products are cached per canonical URL and the
+        settings that shape them, and reused while fresh.
+
         Args:
             url: URL to scrape
             wait_time: Time to wait for API calls in seconds
@@ -113,69 +222,65 @@ class ApiScraper(BaseScraper):
         Returns:
             Dictionary containing scraped data
         """
+        cache_key = {
+            "url": self._canonical_url(url),
+            "force_all_products": settings.api_force_all_products,
+            "target_product_count": settings.api_target_product_count,
+        }
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"X-Cache: HIT {url}")
+            return {**cached, "url": url}
+
+        result = self._scrape_uncached(url, wait_time)
+        if result.get("products") and not result.get("error"):
+            self.result_cache.set(cache_key, result)
+        return result
+
+    @staticmethod
+    def _canonical_url(url: str) -> str:
+        """Return the URL with its query parameters sorted."""
+        parsed = urlparse(url)
+        return urlunparse(parsed._replace(query=urlencode(sorted(parse_qsl(parsed.query)))))
+
+    def _scrape_uncached(self, url: str, wait_time: int) -> Dict[str, Any]:
+        """Scrape a URL through the API or the browser, bypassing the result cache."""
         try:
-            # Set up API interception before navigating
-            self._setup_api_interception()
+            # Skip the browser entirely when the cached config is enough
+            result = self._api_only_scrape(url)
+            if result is not None:
+                return result
 
-            logger.info(f"Navigating to: {url}")
-            
-            # Use route interception to capture and potentially modify API requests
+            if self.page is None:
+                self._start_browser()
+                self._setup_api_interception()
+
+            self.api_responses = []
+            self.original_request_body = None
             captured_response = None
-            original_request_body = None
-            
-            def handle_route(route):
-                """Handle route requests - capture request body and let them through."""
-                request = route.request
-                if "msf-api.gta.com.gt/api/products" in request.url and request.method == "POST":
-                    # Capture the original request body
-                    try:
-                        if request.post_data:
-                            original_request_body = json.loads(request.post_data)
-                            logger.info(f"Captured POST request body: {json.dumps(original_request_body, indent=2)}")
-                    except:
-                        pass
-                route.continue_()
-            
-            self.page.route("**/msf-api.gta.com.gt/api/**", handle_route)
+
+            logger.info(f"Navigating to: {url}")
             
-            # Set up response waiting BEFORE navigation using context manager
-            with self.page.expect_response(
-                lambda response: ("msf-api.gta.com.gt/api/products" in response.url or 
-                                 "msf-api.gta.com.gt/api/catalog/subcategory" in response.url) and
-                                response.status == 200,
-                timeout=30000
-            ) as response_info:
-                # Now navigate
-                self.page.goto(url, wait_until="networkidle", timeout=60000)
-                
-                # Get the response from the context manager
+            # Navigate, waiting for the first products API response
+            try:
+                products_response = self._navigate(url)
+            except PlaywrightTimeoutError as e:
+                logger.warning(f"Timed out waiting for the products API: {e}")
+                # Wait for a late products API call, returning as soon as one lands
+                logger.info(f"Waiting up to {wait_time} seconds for API calls...")
                 try:
-                    products_response = response_info.value
-                    logger.info(f"Received API response: {products_response.url}")
-                    # Read body immediately while response is still valid
-                    try:
-                        body = products_response.json()
-                        captured_response = {
-                            "url": products_response.url,
-                            "method": products_response.request.method,
-                            "status": products_response.status,
-                            "body": body,
-                        }
-                        self.api_responses.append(captured_response)
-                        logger.info("Successfully captured products API response")
-                        if isinstance(body, list):
-                            logger.info(f"  Found {len(body)} items")
-                        elif isinstance(body, dict):
-                            logger.info(f"  Keys: {list(body.keys())}")
-                    except Exception as e:
-                        logger.warning(f"Could not parse products API response: {e}")
-                except Exception as e:
-                    logger.warning(f"Error getting response: {e}")
+                    products_response = self.page.wait_for_event(
+                        "response",
+                        predicate=lambda response: "msf-api.gta.com.gt/api/products" in response.url
+                        and response.status == 200,
+                        timeout=wait_time * 1000,
+                    )
+                except PlaywrightTimeoutError:
+                    logger.info("No products API call within the wait time")
+                    products_response = None
             
-            # Wait additional time for other API calls
-            if not captured_response:
-                logger.info(f"Waiting {wait_time} seconds for API calls...")
-                time.sleep(wait_time)
+            if products_response is not None:
+                captured_response = self._capture_response(products_response)
             
             # Try making additional API calls with different parameters to get more products
             # The API uses POST with type parameter - type 7 might be "on offer", let's try other types
@@ -187,18 +292,10 @@ class ApiScraper(BaseScraper):
                 force_all = settings.api_force_all_products
                 
                 # Load cached best configuration
-                best_config = None
-                cache_file = Path("config/api_config_cache.json")
-                if settings.api_cache_config and cache_file.exists():
-                    try:
-                        with open(cache_file, "r", encoding="utf-8") as f:
-                            cache = json.load(f)
-                            # Use cached config if available
-                            if "best_config" in cache:
-                                best_config = cache["best_config"]
-                                logger.info(f"Using cached best config: {best_config}")
-                    except Exception as e:
-                        logger.debug(f"Could not load cache: {e}")
+                cache = self._load_config_cache()
+                best_config = cache.get("best_config")
+                if best_config is not None:
+                    logger.info(f"Using cached best config: {best_config}")
                 
                 # If we got few products OR force_all is enabled, try other configurations
                 if products_count <= 5 or force_all:
@@ -207,209 +304,55 @@ class ApiScraper(BaseScraper):
                     else:
                         logger.info(f"Only {products_count} product(s) found, trying additional API calls with different parameters...")
                     
-                    # Extract subcategory ID from URL
-                    from urllib.parse import urlparse
-                    parsed = urlparse(url)
-                    path_parts = parsed.path.split('/')
-                    subcategory_id = None
-                    if 'catalog' in path_parts:
-                        try:
-                            catalog_idx = path_parts.index('catalog')
-                            if catalog_idx + 1 < len(path_parts):
-                                subcategory_id = int(path_parts[catalog_idx + 1])
-                        except:
-                            pass
-                    
-                    # Extract price filters from URL
-                    from urllib.parse import parse_qs
-                    query_params = parse_qs(parsed.query)
-                    min_price = query_params.get("minPrice", ["0"])[0]
-                    max_price = query_params.get("maxPrice", ["9999"])[0]
+                    subcategory_id, min_price, max_price = self._parse_catalog_url(url)
                     
                     # Try different type values - prioritize the best config if cached
-                    test_configs = [
-                        {"type": 0, "subcategoryId": subcategory_id},  # All products in subcategory (usually best)
-                        {"type": 1, "subcategoryId": subcategory_id},  # Featured
-                        {"subcategoryId": subcategory_id},  # No type filter
-                        {"type": 0},  # All products, no subcategory
-                        {},  # No filters at all
-                    ]
-                    
-                    # If we have a cached best config, try it first
-                    if best_config and best_config in test_configs:
-                        test_configs.remove(best_config)
-                        test_configs.insert(0, best_config)
+                    test_configs = self._test_configs(subcategory_id, best_config)
                     
                     best_config_found = None
                     max_products_found = products_count
                     
-                    for i, config in enumerate(test_configs, 1):
-                        try:
-                            logger.info(f"Trying API call {i}/{len(test_configs)} with config: {config}...")
-                            
-                            # Build request body
-                            request_body = {
-                                "channel": "web",
-                                "store": {"code": 204}
-                            }
-                            
-                            # Add config parameters
-                            request_body.update(config)
-                            
-                            # Add price filters if available
-                            if min_price and max_price:
-                                request_body["minPrice"] = float(min_price)
-                                request_body["maxPrice"] = float(max_price)
-                            
-                            # Make a direct API call
-                            api_response = self.page.request.post(
-                                "https://msf-api.gta.com.gt/api/products",
-                                data=json.dumps(request_body),
-                                headers={
-                                    "Content-Type": "application/json",
-                                    "Referer": "https://www.misuperfresh.com.gt/",
-                                }
-                            )
-                            
-                            if api_response.status == 200:
-                                body = api_response.json()
-                                products = body.get("products", [])
-                                logger.info(f"  Config {config}: Found {len(products)} products")
-                                
-                                if len(products) > max_products_found:
-                                    max_products_found = len(products)
-                                    best_config_found = config
-                                    logger.info(f"  NEW BEST! Found {len(products)} products with config: {config}")
-                                
-                                if len(products) > products_count:
-                                    # Found more products!
-                                    self.api_responses.append({
-                                        "url": "https://msf-api.gta.com.gt/api/products",
-                                        "method": "POST",
-                                        "status": 200,
-                                        "body": body,
-                                    })
-                                    # Don't break - collect all responses with more products
-                        except Exception as e:
-                            logger.debug(f"Error testing config {config}: {e}")
+                    # Build one request body per config
+                    request_bodies = [
+                        self._build_request_body(config, min_price, max_price)
+                        for config in test_configs
+                    ]
+                    bodies = self._probe_configs(test_configs, request_bodies)
+                    
+                    for config, body in zip(test_configs, bodies):
+                        if not isinstance(body, dict):
                             continue
+                        
+                        products = body.get("products", [])
+                        logger.info(f"  Config {config}: Found {len(products)} products")
+                        
+                        if len(products) > max_products_found:
+                            max_products_found = len(products)
+                            best_config_found = config
+                            logger.info(f"  NEW BEST! Found {len(products)} products with config: {config}")
+                        
+                        if len(products) > products_count:
+                            # Found more products!
+                            self.api_responses.append({
+                                "url": PRODUCTS_API_URL,
+                                "method": "POST",
+                                "status": 200,
+                                "body": body,
+                            })
+                            # Don't break - collect all responses with more products
                     
-                    # Cache the best configuration for future use
-                    if best_config_found and settings.api_cache_config:
-                        try:
-                            cache_file.parent.mkdir(parents=True, exist_ok=True)
-                            cache = {"best_config": best_config_found, "last_updated": time.time()}
-                            with open(cache_file, "w", encoding="utf-8") as f:
-                                json.dump(cache, f, indent=2)
-                            logger.info(f"Cached best config: {best_config_found}")
-                        except Exception as e:
-                            logger.debug(f"Could not cache config: {e}")
-
-            # Collect all products from all API responses
-            # Use the response with the most products
-            products_data = None
-            subcategory_data = None
-            max_products = 0
-
-            for response in self.api_responses:
-                resp_url = response["url"]
-                if "/api/products" in resp_url or "/api/catalog/subcategory" in resp_url:
-                    body = response.get("body")
-                    if body:
-                        if "/api/products" in resp_url:
-                            # Count products in this response
-                            products_list = body.get("products", []) if isinstance(body, dict) else []
-                            product_count = len(products_list) if isinstance(products_list, list) else 0
-                            
-                            # Use the response with the most products
-                            if product_count > max_products:
-                                max_products = product_count
-                                products_data = body
-                                logger.info(f"Found products data with {product_count} products")
-                        elif "/api/catalog/subcategory" in resp_url:
-                            subcategory_data = body
-                            logger.info(f"Found subcategory data")
-            
-            # If we have multiple responses, merge all products
-            all_products_lists = []
-            for response in self.api_responses:
-                if "/api/products" in response.get("url", ""):
-                    body = response.get("body", {})
-                    if isinstance(body, dict) and "products" in body:
-                        products_list = body["products"]
-                        if isinstance(products_list, list):
-                            all_products_lists.append(products_list)
-            
-            # If we have multiple product lists, merge them and deduplicate
-            if len(all_products_lists) > 1:
-                logger.info(f"Merging products from {len(all_products_lists)} API responses...")
-                merged_products = []
-                seen_barcodes = set()
-                
-                for products_list in all_products_lists:
-                    for product in products_list:
-                        barcode = product.get("barcode")
-                        if barcode and barcode not in seen_barcodes:
-                            seen_barcodes.add(barcode)
-                            merged_products.append(product)
-                
-                logger.info(f"Merged {len(merged_products)} unique products from {len(all_products_lists)} responses")
-                
-                # Update products_data with merged list
-                if products_data and isinstance(products_data, dict):
-                    products_data["products"] = merged_products
-
-            # Parse products from API response
-            products = []
-            if products_data:
-                products = self._parse_api_products(products_data)
-            elif subcategory_data:
-                # Try to extract products from subcategory data
-                products = self._parse_subcategory_data(subcategory_data)
-
-            # Check for pagination info in the API response
-            pagination_info = None
-            next_page_url = None
-            
-            if products_data and isinstance(products_data, dict):
-                # Look for pagination fields
-                pagination_fields = ["pagination", "pageInfo", "page_info", "paging", "meta"]
-                for field in pagination_fields:
-                    if field in products_data:
-                        pagination_info = products_data[field]
-                        break
-                
-                # Check if there's a next page
-                if pagination_info:
-                    if isinstance(pagination_info, dict):
-                        has_next = pagination_info.get("hasNext", pagination_info.get("has_next", False))
-                        next_page = pagination_info.get("nextPage", pagination_info.get("next_page"))
-                        if has_next or next_page:
-                            # Construct next page URL if we have page number
-                            current_page = pagination_info.get("currentPage", pagination_info.get("current_page", 1))
-                            total_pages = pagination_info.get("totalPages", pagination_info.get("total_pages"))
-                            if total_pages and current_page < total_pages:
-                                # Try to construct next page URL
-                                from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
-                                parsed = urlparse(url)
-                                params = parse_qs(parsed.query)
-                                params["page"] = [str(current_page + 1)]
-                                new_query = urlencode(params, doseq=True)
-                                next_page_url = urlunparse(parsed._replace(query=new_query))
-                                logger.info(f"Pagination detected: page {current_page}/{total_pages}, next: {next_page_url}")
-
-            return {
-                "url": url,
-                "products": products,
-                "product_count": len(products),
-                "api_responses": len(self.api_responses),
-                "pagination": pagination_info,
-                "next_page": next_page_url,
-                "raw_data": {
-                    "products": products_data,
-                    "subcategory": subcategory_data,
-                },
-            }
+                    # Cache the best configuration, plus the app's own request
+                    # body as a template for API-only scrapes
+                    if best_config_found:
+                        cache["best_config"] = best_config_found
+                    if self.original_request_body:
+                        cache["request_template"] = self.original_request_body
+                    if settings.api_cache_config and cache.get("best_config") and (best_config_found or self.original_request_body):
+                        self._save_config_cache(cache)
+                        logger.info(f"Cached best config: {cache['best_config']}")
+
+            products_data, subcategory_data = self._merge_api_responses()
+            return self._build_result(url, products_data, subcategory_data)
 
         except Exception as e:
             logger.error(f"Error scraping via API: {e}", exc_info=True)
@@ -420,6 +363,422 @@ class ApiScraper(BaseScraper):
                 "error": str(e),
             }
 
+    @staticmethod
+    def _test_configs(
+        subcategory_id: Optional[int],
+        best_config: Optional[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Build the products API filters to probe for a subcategory.
+
+        Args:
+            subcategory_id: Subcategory ID from the catalog URL
+            best_config: Cached best config, tried first when present
+
+        Returns:
+            List of filter parameters
+        """
+        test_configs = [
+            {**config, "subcategoryId": subcategory_id} if "subcategoryId" in config else dict(config)
+            for config in TEST_CONFIGS
+        ]
+
+        # If we have a cached best config, try it first
+        if best_config and best_config in test_configs:
+            test_configs.remove(best_config)
+            test_configs.insert(0, best_config)
+        return test_configs
+
+    def _probe_configs(
+        self,
+        test_configs: List[Dict[str, Any]],
+        request_bodies: List[Dict[str, Any]],
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        POST one request body per config to the products API concurrently.
+
+        Stops waiting once a response reaches the target product count.
+
+        Args:
+            test_configs: Filter parameters, used for logging
+            request_bodies: Request body for each config
+
+        Returns:
+            Response bodies in config order (None where a call failed or
+            was skipped)
+        """
+        logger.info(f"Trying {len(test_configs)} API configs concurrently...")
+        target = settings.api_target_product_count
+        bodies: List[Optional[Dict[str, Any]]] = [None] * len(request_bodies)
+        executor = ThreadPoolExecutor(max_workers=len(request_bodies))
+        try:
+            futures = {
+                executor.submit(self._post_products, request_body): index
+                for index, request_body in enumerate(request_bodies)
+            }
+            for future in as_completed(futures):
+                body = future.result()
+                bodies[futures[future]] = body
+                if target and isinstance(body, dict) and len(body.get("products", [])) >= target:
+                    logger.info(f"  Config {test_configs[futures[future]]} reached {target} products, skipping the rest")
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return bodies
+
+    def _merge_api_responses(self) -> Tuple[Any, Any]:
+        """
+        Select the products and subcategory bodies from the captured responses.
+
+        Picks the products response with the most products and, when there
+        are several, replaces its list with every list merged and
+        deduplicated by barcode.
+
+        Returns:
+            Tuple of (products response body, subcategory response body)
+        """
+        # Collect all products from all API responses in one pass: pick
+        # the response with the most products and merge/deduplicate
+        # every products list by barcode along the way
+        products_data = None
+        subcategory_data = None
+        max_products = 0
+        products_lists = 0
+        merged_products = []
+        seen_barcodes = set()
+
+        for response in self.api_responses:
+            resp_url = response.get("url", "")
+            body = response.get("body")
+            if not body:
+                continue
+
+            if "/api/products" in resp_url:
+                products_list = body.get("products") if isinstance(body, dict) else None
+                if not isinstance(products_list, list):
+                    continue
+
+                products_lists += 1
+                for product in products_list:
+                    barcode = product.get("barcode")
+                    if barcode and barcode not in seen_barcodes:
+                        seen_barcodes.add(barcode)
+                        merged_products.append(product)
+
+                # Use the response with the most products
+                if len(products_list) > max_products:
+                    max_products = len(products_list)
+                    products_data = body
+                    logger.info(f"Found products data with {max_products} products")
+            elif "/api/catalog/subcategory" in resp_url:
+                subcategory_data = body
+                logger.info(f"Found subcategory data")
+
+        # If we have multiple product lists, use the merged, deduplicated one
+        if products_lists > 1:
+            logger.info(f"Merged {len(merged_products)} unique products from {products_lists} responses")
+            if products_data and isinstance(products_data, dict):
+                products_data["products"] = merged_products
+
+        return products_data, subcategory_data
+
+    @retry_with_backoff(max_retries=2, exceptions=(PlaywrightTimeoutError,))
+    def _navigate(self, url: str) -> Response:
+        """
+        Navigate to a URL and wait for the first products API response.
+
+        Timeouts come from settings and are retried once with backoff.
+
+        Args:
+            url: URL to navigate to
+
+        Returns:
+            First successful products API response
+        """
+        # Set up response waiting BEFORE navigation using context manager
+        with self.page.expect_response(
+            lambda response: "msf-api.gta.com.gt/api/products" in response.url and
+                             response.status == 200,
+            timeout=settings.api_response_timeout_ms,
+        ) as response_info:
+            # Only the API response matters; the app keeps loading meanwhile
+            self.page.goto(url, wait_until="commit", timeout=settings.nav_timeout_ms)
+        return response_info.value
+
+    def _build_result(
+        self,
+        url: str,
+        products_data: Any,
+        subcategory_data: Any,
+    ) -> Dict[str, Any]:
+        """
+        Build the scrape result from the selected API response bodies.
+
+        Args:
+            url: URL that was scraped
+            products_data: Products response body with the most products
+            subcategory_data: Subcategory response body, if any
+
+        Returns:
+            Dictionary containing scraped data
+        """
+        # Parse products from API response
+        products = []
+        if products_data:
+            products = self._parse_api_products(products_data)
+        elif subcategory_data:
+            # Try to extract products from subcategory data
+            products = self._parse_subcategory_data(subcategory_data)
+
+        # Check for pagination info in the API response
+        pagination_info = None
+        next_page_url = None
+
+        if products_data and isinstance(products_data, dict):
+            # Look for pagination fields
+            for field in PAGINATION_FIELDS:
+                if field in products_data:
+                    pagination_info = products_data[field]
+                    break
+
+            # Check if there's a next page
+            if pagination_info:
+                if isinstance(pagination_info, dict):
+                    has_next = pagination_info.get("hasNext", pagination_info.get("has_next", False))
+                    next_page = pagination_info.get("nextPage", pagination_info.get("next_page"))
+                    if has_next or next_page:
+                        # Construct next page URL if we have page number
+                        current_page = pagination_info.get("currentPage", pagination_info.get("current_page", 1))
+                        total_pages = pagination_info.get("totalPages", pagination_info.get("total_pages"))
+                        if total_pages and current_page < total_pages:
+                            # Try to construct next page URL
+                            parsed = urlparse(url)
+                            params = parse_qs(parsed.query)
+                            params["page"] = [str(current_page + 1)]
+                            new_query = urlencode(params, doseq=True)
+                            next_page_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}?{new_query}"
+                            logger.info(f"Pagination detected: page {current_page}/{total_pages}, next: {next_page_url}")
+
+        return {
+            "url": url,
+            "products": products,
+            "product_count": len(products),
+            "api_responses": len(self.api_responses),
+            "pagination": pagination_info,
+            "next_page": next_page_url,
+            "raw_data": {
+                "products": products_data,
+                "subcategory": subcategory_data,
+            },
+        }
+
+
+    def _api_only_scrape(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Scrape straight from the products API, without the browser.
+
+        Needs a cached best config from an earlier browser run. The cached
+        request template captured from the app is used as the body when
+        available. With force_all_products, the other filters are probed
+        and merged as on the browser path.
+
+        Args:
+            url: Catalog URL to scrape
+
+        Returns:
+            Dictionary containing scraped data, or None if the browser
+            is needed (cold cache, unknown URL shape, paginated URL or
+            no products)
+        """
+        cache = self._load_config_cache()
+        best_config = cache.get("best_config")
+        if best_config is None:
+            return None
+
+        # The page number only reaches the API through the app, so later
+        # pages go through the browser
+        if "page" in parse_qs(urlparse(url).query):
+            return None
+
+        subcategory_id, min_price, max_price = self._parse_catalog_url(url)
+        config = dict(best_config)
+        if "subcategoryId" in config:
+            if subcategory_id is None:
+                return None
+            config["subcategoryId"] = subcategory_id
+
+        request_body = self._build_request_body(
+            config, min_price, max_price, cache.get("request_template")
+        )
+        logger.info(f"Requesting products API directly with cached config: {config}")
+        body = self._post_products(request_body)
+        if not isinstance(body, dict) or not body.get("products"):
+            logger.info("Direct API request returned no products, falling back to the browser")
+            return None
+
+        self.api_responses = [{
+            "url": PRODUCTS_API_URL,
+            "method": "POST",
+            "status": 200,
+            "body": body,
+        }]
+
+        if settings.api_force_all_products:
+            logger.info("Force all products mode enabled, trying additional API calls...")
+            test_configs = [c for c in self._test_configs(subcategory_id, best_config) if c != config]
+            request_bodies = [
+                self._build_request_body(test_config, min_price, max_price, cache.get("request_template"))
+                for test_config in test_configs
+            ]
+            bodies = self._probe_configs(test_configs, request_bodies) if request_bodies else []
+            products_count = len(body["products"])
+            for test_config, probe_body in zip(test_configs, bodies):
+                if not isinstance(probe_body, dict):
+                    continue
+                products = probe_body.get("products", [])
+                logger.info(f"  Config {test_config}: Found {len(products)} products")
+                if len(products) > products_count:
+                    self.api_responses.append({
+                        "url": PRODUCTS_API_URL,
+                        "method": "POST",
+                        "status": 200,
+                        "body": probe_body,
+                    })
+
+        products_data, _ = self._merge_api_responses()
+        return self._build_result(url, products_data, None)
+
+    @staticmethod
+    def _parse_catalog_url(url: str) -> Tuple[Optional[int], str, str]:
+        """
+        Extract the subcategory ID and price filters from a catalog URL.
+
+        Args:
+            url: Catalog URL (e.g. /catalog/9?minPrice=0&maxPrice=225)
+
+        Returns:
+            Tuple of (subcategory ID or None, min price, max price)
+        """
+        # Extract subcategory ID from URL
+        parsed = urlparse(url)
+        path_parts = parsed.path.split('/')
+        subcategory_id = None
+        if 'catalog' in path_parts:
+            try:
+                catalog_idx = path_parts.index('catalog')
+                if catalog_idx + 1 < len(path_parts):
+                    subcategory_id = int(path_parts[catalog_idx + 1])
+            except:
+                pass
+
+        # Extract price filters from URL
+        query_params = parse_qs(parsed.query)
+        min_price = query_params.get("minPrice", ["0"])[0]
+        max_price = query_params.get("maxPrice", ["9999"])[0]
+        return subcategory_id, min_price, max_price
+
+    @staticmethod
+    def _build_request_body(
+        config: Dict[str, Any],
+        min_price: str,
+        max_price: str,
+        template: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build a products API request body.
+
+        Args:
+            config: Filter parameters (type, subcategoryId)
+            min_price: Minimum price filter
+            max_price: Maximum price filter
+            template: Request body captured from the app, used as the base
+
+        Returns:
+            Request body
+        """
+        if template:
+            request_body = {k: v for k, v in template.items() if k not in CONFIG_KEYS}
+        else:
+            request_body = {
+                "channel": "web",
+                "store": {"code": 204}
+            }
+
+        # Add config parameters
+        request_body.update(config)
+
+        # Add price filters if available
+        if min_price and max_price:
+            request_body["minPrice"] = float(min_price)
+            request_body["maxPrice"] = float(max_price)
+
+        return request_body
+
+    @staticmethod
+    def _load_config_cache() -> Dict[str, Any]:
+        """Load the cached API configuration, or an empty dict."""
+        if not settings.api_cache_config or not CONFIG_CACHE_FILE.exists():
+            return {}
+        try:
+            with open(CONFIG_CACHE_FILE, "rb") as f:
+                return json_loads(f.read())
+        except Exception as e:
+            logger.debug(f"Could not load cache: {e}")
+            return {}
+
+    @staticmethod
+    def _save_config_cache(cache: Dict[str, Any]) -> None:
+        """Persist the API configuration cache."""
+        try:
+            CONFIG_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            cache = {**cache, "last_updated": time.time()}
+            # Write aside and swap in, so concurrent readers never see a
+            # partial file and concurrent writers never interleave
+            tmp_path = CONFIG_CACHE_FILE.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(cache, f, indent=2)
+            os.replace(tmp_path, CONFIG_CACHE_FILE)
+        except Exception as e:
+            logger.debug(f"Could not cache config: {e}")
+
+    def _post_products(self, request_body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        POST a request body directly to the products API.
+
+        Uses the requests session rather than the Playwright page so that
+        several probes can run from worker threads at once. Successful
+        responses are served from the on-disk cache while it is fresh.
+
+        Args:
+            request_body: JSON body for the products endpoint
+
+        Returns:
+            Parsed response body, or None if the call failed
+        """
+        cached = self.response_cache.get(request_body)
+        if cached is not None:
+            return cached
+
+        try:
+            response = self.session.post(
+                PRODUCTS_API_URL,
+                data=json_dumps(request_body),
+                headers={
+                    "Content-Type": "application/json",
+                    "Referer": "https://www.misuperfresh.com.gt/",
+                },
+                timeout=self.timeout,
+            )
+            if response.status_code != 200:
+                logger.debug(f"Products API returned {response.status_code} for {request_body}")
+                return None
+            body = json_loads(response.content)
+            self.response_cache.set(request_body, body)
+            return body
+        except Exception as e:
+            logger.debug(f"Error posting to products API with {request_body}: {e}")
+            return None
+
     def _parse_api_products(self, data: Any) -> List[Dict[str, Any]]:
         """
         Parse products from API response.
@@ -441,10 +800,10 @@ class ApiScraper(BaseScraper):
                     products.append(product)
         elif isinstance(data, dict):
             # Try common keys - products is the most likely
-            possible_keys = ["products", "items", "data", "results", "content"]
-            logger.info(f"Processing dict with keys: {list(data.keys())}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"Processing dict with keys: {list(data.keys())}")
             
-            for key in possible_keys:
+            for key in PRODUCT_LIST_KEYS:
                 if key in data:
                     value = data[key]
                     logger.info(f"Found key '{key}' with type: {type(value)}")
@@ -492,33 +851,21 @@ class ApiScraper(BaseScraper):
         if not isinstance(item, dict):
             return None
 
-        # Try common field names for product name
+        # Try common field names for product name (first non-empty value)
         name = None
-        name_fields = ["name", "productName", "title", "productTitle", "nombre", "descripcion", "description", "productDescription"]
-        for field in name_fields:
-            if field in item:
-                name_value = item[field]
-                if name_value:
-                    name = str(name_value).strip()
-                    break
+        name_value = next((item[field] for field in NAME_FIELDS if item.get(field)), None)
+        if name_value is not None:
+            name = str(name_value).strip()
 
-        # Try common field names for price
+        # Try common field names for price (first field present)
         price = None
-        price_fields = ["price", "precio", "cost", "costo", "amount", "valor", "unitPrice", "unit_price", "salePrice", "sale_price"]
-        for field in price_fields:
-            if field in item:
-                price_value = item[field]
-                if price_value is not None:
-                    # Convert to string and clean
-                    price = str(price_value).strip()
-                    # Remove currency symbols if present
-                    price = price.replace("Q", "").replace("$", "").replace(",", "").strip()
-                    # Keep only numbers and decimal point
-                    import re
-                    price_match = re.search(r'[\d.]+', price)
-                    if price_match:
-                        price = price_match.group(0)
-                break
+        price_field = next((field for field in PRICE_FIELDS if field in item), None)
+        if price_field is not None and item[price_field] is not None:
+            # Remove currency symbols and keep only numbers and decimal point
+            price = str(item[price_field]).translate(CURRENCY_SYMBOLS).strip()
+            price_match = PRICE_PATTERN.search(price)
+            if price_match:
+                price = price_match.group(0)
 
         if name:
             product = {
@@ -561,11 +908,13 @@ class ApiScraper(BaseScraper):
                     if "name" in subcat["category"]:
                         product["category"] = str(subcat["category"]["name"]).strip()
             
-            # Keep raw data for reference
-            product["raw_data"] = item
+            # Keep raw data for reference only when asked to (or debugging),
+            # minus the fields already copied onto the product
+            if settings.api_include_raw_data or logger.isEnabledFor(logging.DEBUG):
+                product["raw_data"] = {k: v for k, v in item.items() if k not in HOISTED_FIELDS}
             
             return product
-        elif logger.isEnabledFor(10):  # DEBUG level
+        elif logger.isEnabledFor(logging.DEBUG):
             logger.debug(f"Could not extract product from item. Available keys: {list(item.keys())}")
 
         return None
@@ -4,10 +4,15 @@ from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any
 from urllib.parse import urljoin, urlparse
 import requests
+from requests.adapters import HTTPAdapter
 from config.settings import settings
 from utils.logger import logger
 from utils.error_handler import retry_with_backoff
 
+# Keep-alive connection pool: hosts kept, and connections kept per host
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 64
+
 
 class BaseScraper(ABC):
     """Abstract base class for web scrapers."""
@@ -35,11 +40,22 @@ class BaseScraper(ABC):
         """Create and configure a requests session."""
         session = requests.Session()
         session.headers.update({"User-Agent": self.user_agent})
+        # Size the pool for concurrent API calls; retries are left to
+        # retry_with_backoff
+        adapter = HTTPAdapter(
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=POOL_MAXSIZE,
+            pool_block=False,
+            max_retries=0,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
         return session
 
     @retry_with_backoff(
         max_retries=3,
         exceptions=(requests.RequestException, requests.Timeout),
+        deadline=settings.timeout * settings.max_retries,
     )
     def fetch_page(self, url: str) -> Optional[requests.Response]:
         """
@@ -1,13 +1,57 @@
 """Parser for misuperfresh.com.gt catalog pages."""
 
-from typing import List, Dict, Any, Optional
+import re
+from collections import Counter
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urljoin
 from bs4 import BeautifulSoup, Tag
+from utils.json_utils import json_loads
 from utils.logger import logger
 
+# Selectors suggested by the debug tooling, tried after the built-in ones
+SUGGESTIONS_FILE = Path("selector_suggestions.json")
+
+# Selectors for the product name / price inside a product element, most
+# specific first
+NAME_SELECTORS = (
+    "h2.product-name",
+    "h3.product-name",
+    ".product-title",
+    ".name",
+    "a.product-link",
+    "h2",
+    "h3",
+)
+PRICE_SELECTORS = (
+    ".price",
+    ".product-price",
+    ".price-current",
+    "[class*='price']",
+    ".cost",
+)
+
+# Text nodes that may hold a price (contain a currency symbol)
+PRICE_TOKEN_PATTERN = re.compile(r'[Q$]')
+
+# Price patterns: Q123.45, $123.45, 123.45, etc.
+PRICE_NUMBER_PATTERN = re.compile(r'[\d,]+\.?\d*')
+PRICE_TEXT_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'Q\s*([\d,]+\.?\d*)',
+        r'\$\s*([\d,]+\.?\d*)',
+        r'([\d,]+\.?\d*)\s*(?:Q|quetzales|GTQ)',
+    )
+)
+
 
 class MisuperfreshParser:
     """Parser for extracting product data from misuperfresh.com.gt."""
 
+    # (mtime, selectors) of the last suggestions file read
+    _suggestions_cache: Optional[Tuple[float, List[str]]] = None
+
     @staticmethod
     def parse_products(soup: BeautifulSoup, debug: bool = False) -> List[Dict[str, Any]]:
         """
@@ -63,23 +107,21 @@ class MisuperfreshParser:
             logger.warning("No products found with common selectors, trying fallback methods")
             
             # Look for price patterns and their parent elements
-            price_elements = soup.find_all(string=lambda text: text and ("Q" in text or "$" in text))
+            price_elements = soup.find_all(string=PRICE_TOKEN_PATTERN)
             logger.debug(f"Found {len(price_elements)} potential price elements")
             
             if price_elements and debug:
-                # Try to find common parent containers
-                parent_containers = set()
-                for price_elem in price_elements[:10]:
-                    parent = price_elem.parent
-                    if parent:
-                        classes = parent.get("class", [])
-                        if classes:
-                            parent_containers.add(".".join(classes))
+                # Try to find common parent containers, most frequent first
+                parent_containers = Counter(
+                    ".".join(price_elem.parent.get("class", []))
+                    for price_elem in price_elements[:10]
+                    if price_elem.parent and price_elem.parent.get("class")
+                )
                 
                 if parent_containers:
-                    logger.info(f"Found potential product containers: {list(parent_containers)[:5]}")
+                    logger.info(f"Found potential product containers: {[c for c, _ in parent_containers.most_common(5)]}")
                     # Try these as selectors
-                    for container_class in list(parent_containers)[:3]:
+                    for container_class, _ in parent_containers.most_common(3):
                         try:
                             found = soup.select(f"div.{container_class}")
                             if found and len(found) >= 3:  # At least 3 similar elements
@@ -97,25 +139,33 @@ class MisuperfreshParser:
         logger.info(f"Extracted {len(products)} products from page")
         return products
 
-    @staticmethod
-    def _load_suggested_selectors() -> List[str]:
-        """Load suggested selectors from debug output if available."""
-        from pathlib import Path
-        import json
-        
-        suggestions_file = Path("selector_suggestions.json")
-        if suggestions_file.exists():
-            try:
-                with open(suggestions_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    suggestions = data.get("suggestions", [])
-                    if suggestions:
-                        logger.info(f"Loaded {len(suggestions)} suggested selectors from debug output")
-                        return suggestions
-            except Exception as e:
-                logger.debug(f"Could not load suggested selectors: {e}")
-        
-        return []
+    @classmethod
+    def _load_suggested_selectors(cls) -> List[str]:
+        """
+        Load suggested selectors from debug output if available.
+
+        The file is re-read only when its modification time changes.
+        """
+        try:
+            mtime = SUGGESTIONS_FILE.stat().st_mtime
+        except OSError:
+            return []
+
+        cached = cls._suggestions_cache
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        suggestions = []
+        try:
+            data = json_loads(SUGGESTIONS_FILE.read_bytes())
+            suggestions = data.get("suggestions", [])
+            if suggestions:
+                logger.info(f"Loaded {len(suggestions)} suggested selectors from debug output")
+        except Exception as e:
+            logger.debug(f"Could not load suggested selectors: {e}")
+
+        cls._suggestions_cache = (mtime, suggestions)
+        return suggestions
 
     @staticmethod
     def _extract_product_data(element: Tag, debug: bool = False) -> Optional[Dict[str, Any]]:
@@ -132,17 +182,7 @@ class MisuperfreshParser:
         try:
             # Try multiple common patterns for product name
             name = None
-            name_selectors = [
-                "h2.product-name",
-                "h3.product-name",
-                ".product-title",
-                ".name",
-                "a.product-link",
-                "h2",
-                "h3",
-            ]
-
-            for selector in name_selectors:
+            for selector in NAME_SELECTORS:
                 name_elem = element.select_one(selector)
                 if name_elem:
                     name = name_elem.get_text(strip=True)
@@ -156,15 +196,7 @@ class MisuperfreshParser:
 
             # Try multiple common patterns for price
             price = None
-            price_selectors = [
-                ".price",
-                ".product-price",
-                ".price-current",
-                "[class*='price']",
-                ".cost",
-            ]
-
-            for selector in price_selectors:
+            for selector in PRICE_SELECTORS:
                 price_elem = element.select_one(selector)
                 if price_elem:
                     price_text = price_elem.get_text(strip=True)
@@ -213,9 +245,8 @@ class MisuperfreshParser:
             return None
 
         # Remove common currency symbols and whitespace, keep numbers and decimal point
-        import re
         # Look for patterns like Q123.45, $123.45, 123.45, etc.
-        price_match = re.search(r'[\d,]+\.?\d*', price_text.replace(',', ''))
+        price_match = PRICE_NUMBER_PATTERN.search(price_text.replace(',', ''))
         if price_match:
             return price_match.group(0)
         return None
@@ -231,16 +262,8 @@ class MisuperfreshParser:
         Returns:
             Price string or None
         """
-        import re
-        # Pattern for prices: Q123.45, $123.45, 123.45, etc.
-        patterns = [
-            r'Q\s*([\d,]+\.?\d*)',
-            r'\$\s*([\d,]+\.?\d*)',
-            r'([\d,]+\.?\d*)\s*(?:Q|quetzales|GTQ)',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in PRICE_TEXT_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1).replace(',', '')
         return None
@@ -257,8 +280,6 @@ class MisuperfreshParser:
         Returns:
             Next page URL or None if not found
         """
-        from urllib.parse import urljoin
-
         # Common pagination selectors
         next_selectors = [
             'a[aria-label="Next"]',
@@ -0,0 +1,145 @@
+"""On-disk caches for products API responses and finished scrapes."""
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from config.settings import settings
+from utils.json_utils import json_dumps, json_loads
+from utils.logger import logger
+
+
+class DiskCache:
+    """Stores JSON values on disk, keyed by a JSON-serializable key, with a TTL."""
+
+    # What an entry holds, for log messages
+    kind = "entry"
+
+    def __init__(self, cache_dir: str, ttl: float):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cached entries
+            ttl: Seconds an entry stays valid (0 disables the cache)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+
+    @property
+    def enabled(self) -> bool:
+        """Whether entries are cached at all."""
+        return self.ttl > 0
+
+    def _path_for(self, key: Dict[str, Any]) -> Path:
+        """Return the cache file path for a key."""
+        digest = hashlib.sha1(json_dumps(key, sort_keys=True).encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
+    def get(self, key: Dict[str, Any]) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Key the value was stored under
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        if not self.enabled:
+            return None
+
+        path = self._path_for(key)
+        try:
+            with open(path, "rb") as f:
+                entry = json_loads(f.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Could not read cached {self.kind} {path}: {e}")
+            return None
+
+        if time.time() - entry.get("stored_at", 0) > self.ttl:
+            return None
+
+        logger.debug(f"Using cached {self.kind} for {key}")
+        return entry.get("body")
+
+    def set(self, key: Dict[str, Any], value: Any) -> None:
+        """
+        Store a value, replacing the file atomically.
+
+        Args:
+            key: Key to store the value under
+            value: JSON-serializable value
+        """
+        if not self.enabled:
+            return
+
+        path = self._path_for(key)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(json_dumps({"stored_at": time.time(), "body": value}))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.debug(f"Could not cache {self.kind} {path}: {e}")
+
+
+class ApiResponseCache(DiskCache):
+    """Stores API response bodies on disk, keyed by the request body."""
+
+    kind = "API response"
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl: Optional[float] = None):
+        """
+        Initialize the response cache.
+
+        Args:
+            cache_dir: Directory holding cached responses
+            ttl: Seconds a cached response stays valid (0 disables the cache)
+        """
+        super().__init__(
+            cache_dir or settings.api_response_cache_dir,
+            settings.api_response_cache_ttl if ttl is None else ttl,
+        )
+
+
+class ScrapeResultCache(DiskCache):
+    """Stores finished scrape results on disk, keyed by URL and scrape settings."""
+
+    kind = "scrape result"
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl: Optional[float] = None):
+        """
+        Initialize the result cache.
+
+        Args:
+            cache_dir: Directory holding cached results
+            ttl: Seconds a cached result stays valid (0 disables the cache)
+        """
+        super().__init__(
+            cache_dir or settings.scrape_cache_dir,
+            settings.scrape_cache_ttl if ttl is None else ttl,
+        )
+
+    def set(self, key: Dict[str, Any], value: Dict[str, Any]) -> None:
+        """
+        Store a scrape result, leaving out raw API data.
+
+        Args:
+            key: Canonical URL and the settings that shape the result
+            value: Scrape result
+        """
+        if not self.enabled:
+            return
+
+        result = {k: v for k, v in value.items() if k != "raw_data"}
+        result["products"] = [
+            {k: v for k, v in product.items() if k != "raw_data"}
+            for product in result.get("products", [])
+        ]
+        super().set(key, result)
@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from config.settings import settings
+from utils.json_utils import json_dumps
 from utils.logger import logger
 
 
@@ -51,7 +52,7 @@ class FileStorage:
         }
 
         with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+            f.write(json_dumps(output_data, indent=True))
 
         logger.info(f"Saved {len(data)} products to JSON: {filepath.absolute()}")
         return filepath
@@ -77,29 +78,27 @@ class FileStorage:
             logger.warning("No data to save to CSV")
             return filepath
 
-        # Get all unique keys from all products
+        # Flatten nested values and collect every column in one pass,
+        # leaving out internal fields
         fieldnames = set()
+        rows = []
         for product in data:
-            fieldnames.update(product.keys())
-        fieldnames = sorted(list(fieldnames))
-
-        # Remove internal fields
-        fieldnames = [f for f in fieldnames if f not in ["raw_data"]]
+            row = {}
+            for key, value in product.items():
+                if key == "raw_data":
+                    continue
+                if isinstance(value, (dict, list)):
+                    row[key] = json.dumps(value, ensure_ascii=False)
+                else:
+                    row[key] = value
+            fieldnames.update(row)
+            rows.append(row)
+        fieldnames = sorted(fieldnames)
 
         with open(filepath, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
-            writer.writeheader()
-            for product in data:
-                # Flatten nested data if needed
-                row = {}
-                for key, value in product.items():
-                    if key == "raw_data":
-                        continue
-                    if isinstance(value, (dict, list)):
-                        row[key] = json.dumps(value, ensure_ascii=False)
-                    else:
-                        row[key] = value
-                writer.writerow(row)
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerows([row.get(key, "") for key in fieldnames] for row in rows)
 
         logger.info(f"Saved {len(data)} products to CSV: {filepath.absolute()}")
         return filepath
@@ -113,12 +112,13 @@ class FileStorage:
             filename: Optional filename (default: products_YYYYMMDD_HHMMSS.parquet)
 
         Returns:
-            Path to saved file or None if pandas/pyarrow not available
+            Path to saved file or None if pyarrow is not available
         """
         try:
-            import pandas as pd
+            import pyarrow as pa
+            import pyarrow.parquet as pq
         except ImportError:
-            logger.warning("pandas not available, skipping Parquet export")
+            logger.warning("pyarrow not available, skipping Parquet export")
             return None
 
         try:
@@ -128,19 +128,16 @@ class FileStorage:
 
             filepath = self.output_dir / filename
 
-            # Convert to DataFrame
-            df = pd.DataFrame(data)
-            # Remove raw_data column if it exists (not serializable)
-            if "raw_data" in df.columns:
-                df = df.drop(columns=["raw_data"])
+            # Build columns straight from the products, in first-seen key
+            # order, leaving out raw_data (not serializable)
+            columns = dict.fromkeys(key for product in data for key in product)
+            columns.pop("raw_data", None)
+            table = pa.table({key: [product.get(key) for product in data] for key in columns})
 
-            df.to_parquet(filepath, index=False)
+            pq.write_table(table, filepath, compression="zstd", compression_level=3, use_dictionary=True)
 
             logger.info(f"Saved {len(data)} products to Parquet: {filepath.absolute()}")
             return filepath
-        except ImportError as e:
-            logger.warning(f"Parquet engine not available (pyarrow/fastparquet missing), skipping Parquet export: {e}")
-            return None
         except Exception as e:
             logger.error(f"Error saving Parquet file: {e}", exc_info=True)
             return None
@@ -159,14 +156,17 @@ class FileStorage:
         saved_files = {}
         format = format or settings.storage_format
 
+        # Share one timestamp so every format of a run has the same stem
+        stem = f"products_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
         if format == "json" or format == "all":
-            saved_files["json"] = self.save_json(data)
+            saved_files["json"] = self.save_json(data, f"{stem}.json")
 
         if format == "csv" or format == "all":
-            saved_files["csv"] = self.save_csv(data)
+            saved_files["csv"] = self.save_csv(data, f"{stem}.csv")
 
         if format == "parquet" or format == "all":
-            parquet_path = self.save_parquet(data)
+            parquet_path = self.save_parquet(data, f"{stem}.parquet")
             if parquet_path:
                 saved_files["parquet"] = parquet_path
 
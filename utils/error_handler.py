@@ -1,8 +1,11 @@
 """Error handling utilities with retry logic."""
 
+import asyncio
+import inspect
+import random
 import time
 from functools import wraps
-from typing import Callable, TypeVar, Any
+from typing import Callable, Optional, TypeVar, Any
 from utils.logger import logger
 
 T = TypeVar("T")
@@ -13,43 +16,89 @@ def retry_with_backoff(
     initial_delay: float = 1.0,
     backoff_factor: float = 2.0,
     exceptions: tuple = (Exception,),
+    max_delay: float = 30.0,
+    deadline: Optional[float] = None,
 ):
     """
-    Decorator for retrying functions with exponential backoff.
+    Decorator for retrying functions with jittered exponential backoff.
+
+    Each delay is drawn between initial_delay and backoff_factor times the
+    previous delay ("decorrelated jitter"), so concurrent callers do not
+    retry in lockstep.
 
     Args:
         max_retries: Maximum number of retry attempts
         initial_delay: Initial delay in seconds
         backoff_factor: Multiplier for delay after each retry
         exceptions: Tuple of exceptions to catch and retry on
+        max_delay: Upper bound for a single delay in seconds
+        deadline: Total seconds allowed across all attempts; no retry is
+            started if its delay would run past it
+
+    Coroutine functions get an async wrapper that waits with asyncio.sleep,
+    so retries do not block the event loop.
     """
 
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        def next_delay(attempt: int, error: Exception, delay: float, give_up_at: Optional[float]) -> Optional[float]:
+            """Log a failed attempt and return the delay before the next one, or None to give up."""
+            if attempt >= max_retries - 1:
+                logger.error(
+                    f"All {max_retries} attempts failed for {func.__name__}"
+                )
+                return None
+            delay = min(max_delay, random.uniform(initial_delay, delay * backoff_factor))
+            if give_up_at is not None and time.monotonic() + delay > give_up_at:
+                logger.error(
+                    f"Attempt {attempt + 1}/{max_retries} failed for {func.__name__}: {error}. "
+                    f"Retry deadline reached, giving up"
+                )
+                return None
+            logger.warning(
+                f"Attempt {attempt + 1}/{max_retries} failed for {func.__name__}: {error}. "
+                f"Retrying in {delay:.2f} seconds..."
+            )
+            return delay
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> T:
+                delay = initial_delay
+                last_exception = None
+                give_up_at = None if deadline is None else time.monotonic() + deadline
+
+                for attempt in range(max_retries):
+                    try:
+                        return await func(*args, **kwargs)
+                    except exceptions as e:
+                        last_exception = e
+                        delay = next_delay(attempt, e, delay, give_up_at)
+                        if delay is None:
+                            break
+                        await asyncio.sleep(delay)
+
+                raise last_exception
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> T:
             delay = initial_delay
             last_exception = None
+            give_up_at = None if deadline is None else time.monotonic() + deadline
 
             for attempt in range(max_retries):
                 try:
                     return func(*args, **kwargs)
                 except exceptions as e:
                     last_exception = e
-                    if attempt < max_retries - 1:
-                        logger.warning(
-                            f"Attempt {attempt + 1}/{max_retries} failed for {func.__name__}: {e}. "
-                            f"Retrying in {delay:.2f} seconds..."
-                        )
-                        time.sleep(delay)
-                        delay *= backoff_factor
-                    else:
-                        logger.error(
-                            f"All {max_retries} attempts failed for {func.__name__}"
-                        )
+                    delay = next_delay(attempt, e, delay, give_up_at)
+                    if delay is None:
+                        break
+                    time.sleep(delay)
 
             raise last_exception
 
         return wrapper
 
     return decorator
-
@@ -1,10 +1,352 @@
 """Logging configuration for the web scraping pipeline."""
 
+import atexit
+import copy
 import logging
+import os
+import queue
+import socket
 import sys
+import threading
+import time
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Optional
 from config.settings import settings
+from utils.json_utils import json_dumps
+
+# Level names accepted for LOG_LEVEL / log_level
+LEVELS = {
+    name: logging.getLevelName(name)
+    for name in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+}
+
+# Write buffer for the log file; records reach the disk in large chunks
+LOG_FILE_BUFFER_SIZE = 1 << 18
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that renders the timestamp once per second, not per record."""
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the formatter; arguments are passed to logging.Formatter."""
+        super().__init__(*args, **kwargs)
+        # (second, formatted) of the last timestamp rendered
+        self._cached_time = (-1, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        """Return the record's timestamp, reusing the string for the same second."""
+        if datefmt is None:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, formatted = self._cached_time
+        if second != cached_second:
+            formatted = time.strftime(datefmt, self.converter(second))
+            self._cached_time = (second, formatted)
+        return formatted
+
+
+# Record formats for the console and the (more detailed) log file
+CONSOLE_FORMATTER = CachedTimeFormatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+FILE_FORMATTER = CachedTimeFormatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+
+
+class CompactJSONFormatter(logging.Formatter):
+    """
+    Formats records as compact one-line JSON objects with short keys.
+
+    Keys: @t (epoch seconds), @l (level initial), @m (message), nm (logger
+    name), plus fn/ln (function and line) for DEBUG records and @x for
+    exception text.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Serialize a record to a JSON line."""
+        entry = {
+            "@t": record.created,
+            "@l": record.levelname[0],
+            "@m": record.getMessage(),
+            "nm": record.name,
+        }
+        if record.levelno <= logging.DEBUG:
+            entry["fn"] = record.funcName
+            entry["ln"] = record.lineno
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["@x"] = record.exc_text
+        return json_dumps(entry)
+
+
+class ExcTextQueueHandler(QueueHandler):
+    """
+    QueueHandler that keeps the traceback apart from the message.
+
+    The stock handler folds the traceback into the message before enqueueing;
+    here it travels as exc_text, so the text formatters still append it and
+    CompactJSONFormatter can report it as @x.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Return a picklable copy of the record with its message merged."""
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = FILE_FORMATTER.formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+class BufferedFileHandler(RotatingFileHandler):
+    """
+    Size-rotated file handler that buffers records instead of flushing
+    after each one.
+
+    Records at ERROR or above are flushed immediately; the rest are written
+    when the buffer fills, on the periodic flush (LOG_FLUSH_INTERVAL) or
+    when the handler is closed (logging flushes every handler at
+    interpreter exit). The file size is tracked
+    in memory, so checking for rollover costs no seek or stat per record.
+    Like RotatingFileHandler, only regular files are rotated, never devices
+    such as /dev/null or pipes.
+    """
+
+    def _open(self):
+        """Open the log file with a large write buffer."""
+        stream = open(
+            self.baseFilename,
+            self.mode,
+            buffering=LOG_FILE_BUFFER_SIZE,
+            encoding=self.encoding,
+            errors=self.errors,
+        )
+        self.bytes_written = stream.tell()
+        # See bpo-45401: never roll over anything other than regular files
+        self._rotatable = os.path.isfile(self.baseFilename)
+        return stream
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write a record, rotating when full and flushing only for errors."""
+        try:
+            msg = self.format(record) + self.terminator
+            # maxBytes is in bytes; non-ASCII text takes more than one each
+            size = len(msg.encode(self.encoding or "utf-8", self.errors or "strict"))
+            if self.stream is None:
+                self.stream = self._open()
+            if (
+                self.maxBytes > 0
+                and self._rotatable
+                and self.bytes_written
+                and self.bytes_written + size >= self.maxBytes
+            ):
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(msg)
+            self.bytes_written += size
+            if record.levelno >= logging.ERROR:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class BufferedDatagramHandler(logging.Handler):
+    """
+    Sends records to a UDP log collector, several records per datagram.
+
+    Records are batched until the next one would push the datagram past
+    max_bytes, or until the handler is flushed. The socket never blocks:
+    a batch the kernel cannot take right away is dropped rather than
+    stalling the logging thread.
+    """
+
+    def __init__(self, host: str, port: int, max_bytes: int = 1400):
+        """
+        Initialize the handler.
+
+        Args:
+            host: Collector host name or address ([brackets] allowed for IPv6)
+            port: Collector UDP port
+            max_bytes: Maximum datagram payload (default fits a 1500-byte MTU)
+
+        Raises:
+            OSError: If the collector address cannot be resolved
+        """
+        super().__init__()
+        # Set before resolving: logging flushes and closes this handler at
+        # exit even if the constructor fails
+        self.buffer = bytearray()
+        self.sock = None
+        self.max_bytes = max_bytes
+        if host.startswith("[") and host.endswith("]"):
+            host = host[1:-1]
+        family, _, _, _, self.address = socket.getaddrinfo(host, port, type=socket.SOCK_DGRAM)[0]
+        self.sock = socket.socket(family, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+
+    def _send(self) -> None:
+        """Send the buffered records as one datagram."""
+        try:
+            self.sock.sendto(self.buffer, self.address)
+        except (BlockingIOError, InterruptedError):
+            pass
+        finally:
+            self.buffer.clear()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Add a record to the current datagram, sending it when full."""
+        try:
+            data = (self.format(record) + "\n").encode("utf-8")
+            if self.buffer and len(self.buffer) + len(data) > self.max_bytes:
+                self._send()
+            self.buffer.extend(data)
+            if len(self.buffer) >= self.max_bytes:
+                self._send()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        """Send any buffered records."""
+        with self.lock:
+            if self.buffer and self.sock is not None:
+                self._send()
+
+    def close(self) -> None:
+        """Send buffered records and close the socket."""
+        try:
+            self.flush()
+            if self.sock is not None:
+                self.sock.close()
+        finally:
+            super().close()
+
+
+# Buffered handlers flushed periodically by a background thread
+_flush_registry = []
+_stop_flushing = threading.Event()
+
+
+@lru_cache(maxsize=1)
+def _start_flusher() -> None:
+    """Start the thread that flushes buffered handlers every few seconds."""
+
+    def flush_periodically():
+        while not _stop_flushing.wait(settings.log_flush_interval):
+            for handler in _flush_registry:
+                try:
+                    handler.flush()
+                except Exception:
+                    pass
+
+    # logging flushes every handler itself at exit
+    atexit.register(_stop_flushing.set)
+    threading.Thread(target=flush_periodically, name="log-flusher", daemon=True).start()
+
+
+@lru_cache(maxsize=None)
+def _start_listener(log_file: Optional[str]) -> ExcTextQueueHandler:
+    """
+    Build the console/file handlers and run them on a background thread.
+
+    Handlers are built once per log file and shared by every logger that
+    uses it.
+
+    Args:
+        log_file: File path for file logging, or None for console only
+
+    Returns:
+        Queue handler feeding the background handlers
+    """
+    handlers = []
+
+    # Console handler, only when someone is watching (or a file is missing);
+    # a piped stdout that nobody reads would otherwise stall the writer
+    if sys.stdout.isatty() or settings.log_force_console or not log_file:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(CONSOLE_FORMATTER)
+        handlers.append(console_handler)
+
+    # File handler (if specified)
+    if log_file:
+        log_path = Path(log_file)
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        file_handler = BufferedFileHandler(
+            log_path,
+            maxBytes=settings.log_max_bytes,
+            backupCount=settings.log_backup_count,
+            encoding="utf-8",
+            delay=True,
+        )
+        file_handler.setLevel(logging.DEBUG)
+        if settings.log_format == "json":
+            file_handler.setFormatter(CompactJSONFormatter())
+        else:
+            file_handler.setFormatter(FILE_FORMATTER)
+        handlers.append(file_handler)
+        if settings.log_flush_interval > 0:
+            _flush_registry.append(file_handler)
+            _start_flusher()
+
+    # Remote collector (if specified), e.g. LOG_UDP_ADDR=logs.internal:5140
+    # A collector that is down or misconfigured must not stop the pipeline
+    udp_handler = None
+    if settings.log_udp_addr:
+        try:
+            host, _, port = settings.log_udp_addr.rpartition(":")
+            udp_handler = BufferedDatagramHandler(host, int(port))
+        except (ValueError, OSError) as e:
+            print(
+                f"Warning: ignoring LOG_UDP_ADDR={settings.log_udp_addr!r} ({e}); "
+                "expected host:port",
+                file=sys.stderr,
+            )
+    if udp_handler is not None:
+        udp_handler.setLevel(logging.DEBUG)
+        if settings.log_format == "json":
+            udp_handler.setFormatter(CompactJSONFormatter())
+        else:
+            udp_handler.setFormatter(FILE_FORMATTER)
+        handlers.append(udp_handler)
+        if settings.log_flush_interval > 0:
+            _flush_registry.append(udp_handler)
+            _start_flusher()
+
+    # Callers only enqueue records; formatting and I/O happen on the
+    # listener thread, which is drained before logging shuts down
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return ExcTextQueueHandler(log_queue)
+
+
+def _apply_global_disable(level: int) -> None:
+    """
+    Drop records below a WARNING+ level before any logger looks at them.
+
+    logging.disable is process-wide, so it is only raised, never lowered,
+    and only when INFO output is not wanted at all.
+    """
+    if level > logging.INFO and logging.root.manager.disable < level - 10:
+        logging.disable(level - 10)
+
+
+# Names of loggers already set up by setup_logger
+_configured = set()
 
 
 def setup_logger(
@@ -15,6 +357,10 @@ def setup_logger(
     """
     Set up and configure a logger instance.
 
+    Each logger name is configured once; later calls return the existing
+    logger as is. Pass arguments %-style (logger.info("got %s", url)) so
+    messages below the level are never built.
+
     Args:
         name: Logger name
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
@@ -24,37 +370,18 @@ def setup_logger(
         Configured logger instance
     """
     logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, log_level or settings.log_level, logging.INFO))
-
-    # Remove existing handlers to avoid duplicates
-    logger.handlers.clear()
+    if name in _configured:
+        return logger
 
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
-    console_format = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-    console_handler.setFormatter(console_format)
-    logger.addHandler(console_handler)
-
-    # File handler (if specified)
-    if log_file or settings.log_file:
-        log_path = Path(log_file or settings.log_file)
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        file_handler = logging.FileHandler(log_path)
-        file_handler.setLevel(logging.DEBUG)
-        file_format = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
-        file_handler.setFormatter(file_format)
-        logger.addHandler(file_handler)
+    level = LEVELS.get((log_level or settings.log_level).upper(), logging.INFO)
+    logger.setLevel(level)
+    logger.propagate = False
+    _apply_global_disable(level)
+    logger.addHandler(_start_listener(log_file or settings.log_file or None))
+    _configured.add(name)
 
     return logger
 
 
 # Default logger instance
 logger = setup_logger("web_scraper")
-